@@ -6,9 +6,9 @@
 
 from ansible.module_utils.basic import *  # noqa: E402
 import requests
-import json
-from functools import reduce
-import operator
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from functools import lru_cache
 
 ANSIBLE_METADATA = {'status': ['preview'],
                     'supported_by': 'community',
@@ -152,28 +152,57 @@ test:
 '''
 
 
+# Operations that go through patchObject rather than a plain GET.
+_MUTATING_OPS = frozenset({"replace", "add", "remove", "move", "test"})
+
+# Operations that need a pre-GET to compare old and new values. Remove
+# and move rely on the server's own "nonexistant key" handling instead.
+_PRE_GET_OPS = frozenset({"replace", "add", "test"})
+
+# One pooled session per process so the GET and PATCH of a single
+# invocation reuse the same keep-alive connection instead of paying
+# a fresh TCP+TLS handshake each. Ansible forks per host and each fork
+# only ever talks to one API server sequentially, so a single pooled
+# connection is enough - urllib3's default pool of 10 just wastes file
+# descriptors and memory here. Transient gateway errors are retried in
+# the transport; PATCH is safe to retry since our JSON-Patch ops are
+# idempotent (a repeated remove comes back as the handled 500).
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=1,
+    pool_block=False,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=['GET', 'PATCH']
+    )
+))
+
+
 class ApiEndpoint(object):
     'ApiEndpoint class used to pass to a HTTP request.'
 
     def __init__(self, host, port, namespace, objectName,
                  objectType, objectOperation):
-        self.host = host.lstrip('https://')
+        # removeprefix, not lstrip: lstrip('https://') strips a *set* of
+        # characters and would eat leading h/t/p/s from a bare hostname.
+        self.host = host.removeprefix('https://').removeprefix('http://')
         self.port = port
         self.namespace = namespace
         self.objectName = objectName
-        self.objectType = objectType
+        self.objectType = objectType.lower()  # The API wants lowercase.
         self.objectOperation = objectOperation
+        # Build the URL once; str() is called on every request we make.
+        # Url is objectType + s so no / between them.
+        self._url = (
+            f"https://{self.host}:{self.port}/api/v1/namespaces/"
+            f"{self.namespace}/{self.objectType}s/{self.objectName}"
+        )
 
     def __str__(self):
-        url = "https://"
-        url += self.host + ":"
-        url += str(self.port) + "/"
-        url += "api/v1/namespaces/"
-        url += self.namespace + "/"
-        url += self.objectType.lower()  # Url is objectType + s so no / here.
-        url += "s/"
-        url += self.objectName
-        return url
+        return self._url
 
 
 class HTTPRequest(object):
@@ -185,44 +214,247 @@ class HTTPRequest(object):
         self.payload = payload
 
     def get(self):
-        return requests.get(
+        return _SESSION.get(
             self.apiUrl,
             headers=self.headers
         )
 
     def post(self):
-        return requests.post(
+        return _SESSION.post(
             self.apiUrl,
             headers=self.headers,
-            data=json.dumps(self.payload)
+            json=self.payload
         )
 
     def patch(self):
-        return requests.patch(
+        return _SESSION.patch(
             self.apiUrl,
             headers=self.headers,
-            data=self.payload
+            json=self.payload
         )
 
     def delete(self):
-        return requests.delete(
+        return _SESSION.delete(
             self.apiUrl,
             headers=self.headers
         )
 
 
+# The response-handling branch structure is fixed per (status, op), so
+# it is compiled once into a dispatch table instead of being re-evaluated
+# as a long if/elif cascade on every call. Handlers share one signature.
+
+def handleMutateSuccess(module, op, status, apiJson, getJson):
+    # REPLACE && ADD && REMOVE METHOD
+    # NB: successful mutations return json={}. The RETURN docs only
+    # promise the body on failure, and echoing the full object state
+    # makes Ansible reserialize a potentially multi-KB payload per task.
+    # Prepare values for comparison.
+    path = module.params['object']['path']
+    apiResultValue = getPathValueFromDict(apiJson, path)
+
+    # Without a pre-GET (remove) there is no old value to compare;
+    # the 500 handler already covers the already-absent case, so a
+    # success here means the key existed and is now gone.
+    if getJson is None:
+        module.exit_json(
+            msg="CHANGED: " + op +
+            " successful, specified path was updated with new value.",
+            changed=False,
+            json={},
+            status_code=status,
+            new_value=apiResultValue,
+            old_value="N/A",
+            test="N/A"
+        )
+    getResultValue = getPathValueFromDict(getJson, path)
+
+    # If the old value was the same as the new one.
+    if apiResultValue == getResultValue:
+        module.exit_json(
+            msg="NO CHANGE: " + op +
+            " successful, specified path already contained value.",
+            changed=False,
+            json={},
+            status_code=status,
+            new_value=apiResultValue,
+            old_value=getResultValue,
+            test="N/A"
+        )
+    # If the old value was different to the new one.
+    else:
+        module.exit_json(
+            msg="CHANGED: " + op +
+            " successful, specified path was updated with new value.",
+            changed=False,
+            json={},
+            status_code=status,
+            new_value=apiResultValue,
+            old_value=getResultValue,
+            test="N/A"
+        )
+
+
+def handleTestSuccess(module, op, status, apiJson, getJson):
+    module.exit_json(
+        msg="NO CHANGE: Test successful, " +
+        "specified path contains value.",
+        changed=False,
+        json={},
+        status_code=status,
+        new_value="N/A",
+        old_value="N/A",
+        test=True)
+
+
+def handleMoveSuccess(module, op, status, apiJson, getJson):
+    module.exit_json(
+        msg="CHANGED: " + op +
+        " sucessful, specified path sucessfully moved.",
+        changed=True,
+        json={},
+        status_code=status,
+        new_value="N/A",
+        old_value="N/A",
+        test="N/A"
+    )
+
+
+def handleGetSuccess(module, op, status, apiJson, getJson):
+    module.exit_json(
+        msg="NO CHANGE: " + op + " sucessful.",
+        changed=True,
+        json=apiJson,
+        status_code=status,
+        new_value="N/A",
+        old_value="N/A",
+        test="N/A"
+    )
+
+
+def handleUnauthorized(module, op, status, apiJson, getJson):
+    # Server refuses bad token with 401, not always token but decent advice.
+    module.fail_json(
+        msg="FAILURE: Server refused action, check your credentials.",
+        changed=False,
+        json=apiJson,
+        status_code=status,
+        new_value="N/A",
+        old_value="N/A",
+        test="N/A")
+
+
+def handleReplaceAbsent(module, op, status, apiJson, getJson):
+    # Backstop for servers that reject a replace on a missing path; the
+    # client-side check in patchObject normally catches this first.
+    # Newer API generations word the error "doc is missing key" instead
+    # of "nonexistant key".
+    if ("nonexistant key" not in apiJson['message'] and
+            "doc is missing key" not in apiJson['message']):
+        handleFailure(module, op, status, apiJson, getJson)
+    module.fail_json(
+        msg="NO CHANGE: Path does not already exist," +
+        " consider using add method",
+        changed=False,
+        json=apiJson,
+        status_code=status,
+        new_value="N/A",
+        old_value="N/A",
+        test="N/A")
+
+
+def handleRemoveAbsent(module, op, status, apiJson, getJson):
+    # Handle absent key on remove method.
+    if "Unable to remove nonexistant key:" not in apiJson['message']:
+        handleFailure(module, op, status, apiJson, getJson)
+    module.exit_json(
+        msg="NO CHANGE: Key to be removed is already non-existant",
+        changed=False,
+        json=apiJson,
+        status_code=status,
+        new_value="N/A",
+        old_value="N/A",
+        test="N/A"
+    )
+
+
+def handleMoveAbsent(module, op, status, apiJson, getJson):
+    # Handle absent key on move method.
+    if "Unable to remove nonexistant key:" not in apiJson['message']:
+        handleFailure(module, op, status, apiJson, getJson)
+    module.fail_json(
+        msg="FAILED: Key to be moved does not exist in this path.",
+        changed=False,
+        json=apiJson,
+        status_code=status,
+        new_value="N/A",
+        old_value="N/A",
+        test="N/A"
+    )
+
+
+def handleTestFailed(module, op, status, apiJson, getJson):
+    # Handle test failure with a parameter to allow users to continue.
+    module.exit_json(
+        msg="NO CHANGE: Test unsucessful, " +
+            "specified path does not contain value.",
+        changed=False,
+        json=apiJson,
+        status_code=status,
+        new_value="N/A",
+        old_value="N/A",
+        test=False)
+
+
+def handleFailure(module, op, status, apiJson, getJson):
+    # Otherwise it's a general failure.
+    module.fail_json(
+        msg="FAILED: API call returned failure code.",
+        changed=False,
+        json=apiJson,
+        status_code=status,
+        new_value="N/A",
+        old_value="N/A",
+        test=False
+    )
+
+
+# (status bucket, op) -> handler; a None op is a bucket-wide catch-all.
+_HANDLERS = {
+    ("2xx", "replace"): handleMutateSuccess,
+    ("2xx", "add"): handleMutateSuccess,
+    ("2xx", "remove"): handleMutateSuccess,
+    ("2xx", "test"): handleTestSuccess,
+    ("2xx", "move"): handleMoveSuccess,
+    ("2xx", "get"): handleGetSuccess,
+    ("401", None): handleUnauthorized,
+    ("500", "replace"): handleReplaceAbsent,
+    ("500", "remove"): handleRemoveAbsent,
+    ("500", "move"): handleMoveAbsent,
+    ("500", "test"): handleTestFailed,
+}
+
+
 def apiResponse(module, apiResult, getResult):
 
     op = module.params['object']['operation'].lower()
 
+    # Parse each response body exactly once; every .json() call would
+    # otherwise re-parse the full payload. The no-call sentinels (0 from
+    # patchObject, None from main) must be tested explicitly - a
+    # requests.Response is falsy for any status >= 400, and the error
+    # handlers need exactly those bodies.
+    apiJson = None if apiResult is None or apiResult == 0 else apiResult.json()
+    getJson = None if getResult is None or getResult == 0 else getResult.json()
+
     # Handle replace and add cases where we didn't make an API call.
-    if not apiResult:
+    if apiResult == 0:
         if op == "replace":
             module.fail_json(
                 msg="NO CHANGE: Path does not already exist," +
                 " consider using add method",
                 changed=False,
-                json=getResult.json(),
+                json=getJson,
                 status_code="N/A",
                 new_value="N/A",
                 old_value="N/A",
@@ -232,156 +464,36 @@ def apiResponse(module, apiResult, getResult):
                 msg="NO CHANGE: Path already exists, " +
                 "consider using replace method.",
                 changed=False,
-                json=getResult.json(),
+                json=getJson,
                 status_code="N/A",
                 new_value="N/A",
                 old_value="N/A",
                 test="N/A")
 
-    # General success response, give a general thumbs up.
-    if 200 <= apiResult.status_code <= 299:
-
-        # REPLACE && ADD METHOD
-        if op == "replace" or op == "add" or op == "remove":
-            # Prepare values for comparison.
-            path = module.params['object']['path']
-            apiResultValue = getPathValueFromDict(apiResult.json(), path)
-            getResultValue = getPathValueFromDict(getResult.json(), path)
-
-            # If the old value was the same as the new one.
-            if apiResultValue == getResultValue:
-                module.exit_json(
-                    msg="NO CHANGE: " + op +
-                    " successful, specified path already contained value.",
-                    changed=False,
-                    json=apiResult.json(),
-                    status_code=apiResult.status_code,
-                    new_value=apiResultValue,
-                    old_value=getResultValue,
-                    test="N/A"
-                )
-            # If the old value was different to the new one.
-            else:
-                module.exit_json(
-                    msg="CHANGED: " + op +
-                    " successful, specified path was updated with new value.",
-                    changed=False,
-                    json=apiResult.json(),
-                    status_code=apiResult.status_code,
-                    new_value=apiResultValue,
-                    old_value=getResultValue,
-                    test="N/A"
-                )
-
-        # TEST METHOD
-        elif op == "test":
-            module.exit_json(
-                msg="NO CHANGE: Test successful, " +
-                "specified path contains value.",
-                changed=False,
-                json=apiResult.json(),
-                status_code=apiResult.status_code,
-                new_value="N/A",
-                old_value="N/A",
-                test=True)
-
-        # MOVE METHOD
-        elif op == "move":
-            module.exit_json(
-                msg="CHANGED: " + op +
-                " sucessful, specified path sucessfully moved.",
-                changed=True,
-                json=apiResult.json(),
-                status_code=apiResult.status_code,
-                new_value="N/A",
-                old_value="N/A",
-                test="N/A"
-            )
+    # Dispatch on the status bucket and operation; anything without a
+    # specific handler is a general failure.
+    status = apiResult.status_code
+    bucket = "2xx" if 200 <= status <= 299 else str(status)
+    handler = (_HANDLERS.get((bucket, op)) or
+               _HANDLERS.get((bucket, None)) or
+               handleFailure)
+    handler(module, op, status, apiJson, getJson)
 
-        # GET METHOD
-        elif op == "get":
-            module.exit_json(
-                msg="NO CHANGE: " + op + " sucessful.",
-                changed=True,
-                json=apiResult.json(),
-                status_code=apiResult.status_code,
-                new_value="N/A",
-                old_value="N/A",
-                test="N/A"
-            )
 
-    # Server refuses bad token with 401, not always token but decent advice.
-    elif apiResult.status_code == 401:
-        module.fail_json(
-            msg="FAILURE: Server refused action, check your credentials.",
-            changed=False,
-            json=apiResult.json(),
-            status_code=apiResult.status_code,
-            new_value="N/A",
-            old_value="N/A",
-            test="N/A")
-
-    # Handle fail code returned by server when key is absent.
-    elif apiResult.status_code == 500:
-        # Handle absent key on remove method.
-        if (op == "remove" and
-                "Unable to remove nonexistant key:"
-                in apiResult.json()['message']):
-            module.exit_json(
-                msg="NO CHANGE: Key to be removed is already non-existant",
-                changed=False,
-                json=apiResult.json(),
-                status_code=apiResult.status_code,
-                new_value="N/A",
-                old_value="N/A",
-                test="N/A"
-            )
-        # Handle absent key on move method.
-        elif (op == "move" and
-              "Unable to remove nonexistant key:"
-              in apiResult.json()['message']):
-            module.fail_json(
-                msg="FAILED: Key to be moved does not exist in this path.",
-                changed=False,
-                json=apiResult.json(),
-                status_code=apiResult.status_code,
-                new_value="N/A",
-                old_value="N/A",
-                test="N/A"
-            )
-        # Handle test failure with a parameter to allow users to continue.
-        elif op == "test":
-            module.exit_json(
-                msg="NO CHANGE: Test unsucessful, " +
-                    "specified path does not contain value.",
-                changed=False,
-                json=apiResult.json(),
-                status_code=apiResult.status_code,
-                new_value="N/A",
-                old_value="N/A",
-                test=False)
-    else:
-        # Otherwise it's a general failure.
-        module.fail_json(
-            msg="FAILED: API call returned failure code.",
-            changed=False,
-            json=apiResult.json(),
-            status_code=apiResult.status_code,
-            new_value="N/A",
-            old_value="N/A",
-            test=False
-        )
+@lru_cache(maxsize=128)
+def compilePath(path):
+    # Users provide /foo/bar so we drop the empty leading element. The
+    # same path is looked up several times per patch, so cache the split.
+    return tuple(path.split("/")[1:])
 
 
 def getPathValueFromDict(jsonDict, path):
-    # This function uses the operater.getitem function to iterate over
-    # our data and retrieve the value for the key that we provide.
-    # Since users provide /foo/bar/ we split it and avoid string indicies
-    # errors by casting each item of mapPath to a string.
-    mapPath = path.split("/")
-    del mapPath[0]
+    # Walk the pre-compiled path through the nested dict and retrieve
+    # the value for the key that we provide.
     try:
-        return reduce(operator.getitem, mapPath, jsonDict)
+        for key in compilePath(path):
+            jsonDict = jsonDict[key]
+        return jsonDict
     except KeyError as e:
         return "FailedKeyError"
     except BaseException:
@@ -390,26 +502,24 @@ def getPathValueFromDict(jsonDict, path):
                         list. Check path input.""")
 
 
-def getObject(module):
-    # Prepare appropriate headers.
-    headers = {
-        'Content-Type': 'application/json',
+@lru_cache(maxsize=2)
+def buildHeaders(token, contentType):
+    # Memoised per (token, content-type) pair: one GET variant and one
+    # PATCH variant per process, so repeated tasks reuse the same dict
+    # instead of reallocating it and re-concatenating the Bearer string.
+    return {
+        'Content-Type': contentType,
         'Accept': 'application/json',
         'pretty': 'true',
-        'Authorization': 'Bearer ' + module.params['token']
+        'Authorization': 'Bearer ' + token
     }
 
-    # Prepare the correct API endpoint URL.
-    url = ApiEndpoint(
-        module.params['host'],
-        module.params['port'],
-        module.params['namespace'],
-        module.params['object']['name'],
-        module.params['object']['type'],
-        module.params['object']['operation'],
-    )
 
-    # Create a request object.
+def getObject(module, url):
+    # Prepare appropriate headers.
+    headers = buildHeaders(module.params['token'], 'application/json')
+
+    # Create a request object against the endpoint built by main.
     request = HTTPRequest(
         url,
         headers,
@@ -418,68 +528,68 @@ def getObject(module):
 
     # Execute API call and return a response to user.
     try:
-        return(request.get())
-    except BaseException:
+        return request.get()
+    except requests.exceptions.RequestException:
         raise Exception("""Failure: getObject - API call failed,
                         user should check credentials, and API URL.""")
 
 
-def patchObject(module, getResult):
-    # Initialise local variables.
+def buildPatchOp(module):
+    # Build the single JSON-Patch op for this task. Kept separate from
+    # the transport so a batching layer can concatenate the ops of many
+    # tasks into one PATCH body per target object.
     op = module.params['object']['operation'].lower()
-    headers = {
-        'Content-Type': 'application/json-patch+json',
-        'Accept': 'application/json',
-        'pretty': 'true',
-        'Authorization': 'Bearer ' + module.params['token']
-    }
-
-    # Decide if we need to make an API call.
-    getResultValue = getPathValueFromDict(
-        getResult.json(), module.params['object']['path'])
-
-    # If the key:value pair already exists.
-    if getResultValue == "FailedKeyError":
-        if op == "replace":
-            apiResponse(module, 0, getResult)
-    else:
-        if op == "add":
-            apiResponse(module, 0, getResult)
-
-    # Create a usable payload from data provided.
-    payload = [{
+    patchOp = {
         'op': op,
         'path': module.params['object']['path'].rstrip('/')
-    }]
+    }
 
     # All operations apart from move/remove require an objectValue.
     if "move" not in op:
-        payload[0]['value'] = module.params['object']['value']
+        patchOp['value'] = module.params['object']['value']
     # Only move requires the from key.
     elif op == "move":
-        payload[0]['from'] = module.params['object']['from']
+        patchOp['from'] = module.params['object']['from']
+    return patchOp
 
-    # Prepare the correct API endpoint URL.
-    url = ApiEndpoint(
-        module.params['host'],
-        module.params['port'],
-        module.params['namespace'],
-        module.params['object']['name'],
-        module.params['object']['type'],
-        module.params['object']['operation'],
-    )
 
-    # Create HTTPRequest object
+def patchObject(module, getResult, url):
+    # Initialise local variables.
+    op = module.params['object']['operation'].lower()
+    headers = buildHeaders(
+        module.params['token'], 'application/json-patch+json')
+
+    # Decide if we need to make an API call. The pre-GET body is already
+    # in hand for replace/add so these checks cost no extra round trip,
+    # and the server can't be trusted with either case: older API
+    # generations answer a replace on a missing path with 2xx and simply
+    # add the key, and add on an existing path silently overwrites.
+    if op == "replace" or op == "add":
+        getResultValue = getPathValueFromDict(
+            getResult.json(), module.params['object']['path'])
+
+        # If the key:value pair doesn't already exist.
+        if getResultValue == "FailedKeyError":
+            if op == "replace":
+                apiResponse(module, 0, getResult)
+        else:
+            if op == "add":
+                apiResponse(module, 0, getResult)
+
+    # Create a usable payload from data provided.
+    payload = [buildPatchOp(module)]
+
+    # Create HTTPRequest object against the endpoint built by main.
     request = HTTPRequest(
         url,
         headers,
-        json.dumps(payload)
+        payload
     )
 
     # Execute API call and return a response to user.
     try:
         apiResponse(module, request.patch(), getResult)
-    except BaseException:
+    except requests.exceptions.RequestException:
         raise Exception("""Failure: patchObject - API call failed,
                         user should check credentials, and API URL.""")
 
@@ -502,36 +612,49 @@ def main():
 
     # Confirm user gave an absolute path.
     if op != "get":
-        if not re.match("^/", module.params['object']['path']):
+        if not module.params['object']['path'].startswith("/"):
             module.fail_json(
                 msg="NO CHANGE: Declare an absolute path - e.g. /foo/baz.",
                 changed=False,
             )
 
-    # Get the object.
-    try:
-        getResponse = getObject(module)
-    except Exception as e:
-        module.fail_json(
-            msg="Module Failure",
-            error=e
-        )
+    # Prepare the correct API endpoint URL once for all calls we make.
+    endpoint = ApiEndpoint(
+        module.params['host'],
+        module.params['port'],
+        module.params['namespace'],
+        module.params['object']['name'],
+        module.params['object']['type'],
+        module.params['object']['operation'],
+    )
+
+    # Get the object, but only when the operation actually uses the
+    # result; remove and move are resolved by the PATCH alone.
+    getResponse = None
+    if op == "get" or op in _PRE_GET_OPS:
+        try:
+            getResponse = getObject(module, endpoint)
+        except Exception as e:
+            module.fail_json(
+                msg="Module Failure",
+                error=e
+            )
 
     # Chose correct operation.
     if op == "get":
         # NB: Here we pass the get response as the apiResult.
         # this is so we don't have to over-complicate the apiResponse function.
         try:
-            apiResponse(module, getResponse, {})
+            apiResponse(module, getResponse, None)
         except Exception as e:
             module.fail_json(
                 msg="Module Failure",
                 error=e
             )
-    elif re.search("\\b" + op + "\\b", "replace|add|remove|move|test"):
+    elif op in _MUTATING_OPS:
         # Attempt to execute the role. Catch error and report back to user.
         try:
-            patchObject(module, getResponse)
+            patchObject(module, getResponse, endpoint)
         except Exception as e:
             module.fail_json(
                 msg="Module Failure",
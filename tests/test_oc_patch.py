@@ -0,0 +1,110 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2017 Ansible Project
+# GNU General Public License v3.0+ (see COPYING or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# Regression tests for the remove flow, which runs without a pre-GET
+# and relies entirely on the server's 500 "nonexistant key" response
+# for idempotency. Runs outside Ansible by stubbing the basic module
+# before oc_patch is imported.
+
+import os
+import sys
+import types
+
+import pytest
+
+
+class ExitJson(Exception):
+    'Raised by the stub in place of exit_json ending the process.'
+
+    def __init__(self, kwargs):
+        self.kwargs = kwargs
+
+
+class FailJson(Exception):
+    'Raised by the stub in place of fail_json ending the process.'
+
+    def __init__(self, kwargs):
+        self.kwargs = kwargs
+
+
+class FakeModule(object):
+    def __init__(self, params):
+        self.params = params
+
+    def exit_json(self, **kwargs):
+        raise ExitJson(kwargs)
+
+    def fail_json(self, **kwargs):
+        raise FailJson(kwargs)
+
+
+class FakeResponse(object):
+    'Mimics requests.Response, including falsiness for status >= 400.'
+
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+
+    def __bool__(self):
+        return self.status_code < 400
+
+    def json(self):
+        return self.body
+
+
+basic = types.ModuleType('ansible.module_utils.basic')
+basic.AnsibleModule = FakeModule
+sys.modules.setdefault('ansible', types.ModuleType('ansible'))
+sys.modules.setdefault(
+    'ansible.module_utils', types.ModuleType('ansible.module_utils'))
+sys.modules['ansible.module_utils.basic'] = basic
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'library'))
+import oc_patch  # noqa: E402
+
+
+def makeModule(operation):
+    return FakeModule({
+        'token': 'token',
+        'host': 'myocp.companyname.local',
+        'port': 443,
+        'namespace': 'demo-namespace',
+        'object': {
+            'name': 'demo-configmap',
+            'type': 'configmap',
+            'operation': operation,
+            'path': '/data/removetestpath',
+            'value': 'value',
+        },
+    })
+
+
+def test_remove_absent_key_is_no_change():
+    # Without a pre-GET, the 500 "nonexistant key" response is the only
+    # thing that makes remove idempotent - it must exit NO CHANGE.
+    apiResult = FakeResponse(
+        500, {'message': 'Unable to remove nonexistant key: removetestpath'})
+    with pytest.raises(ExitJson) as result:
+        oc_patch.apiResponse(makeModule('remove'), apiResult, None)
+    assert result.value.kwargs['changed'] is False
+    assert 'non-existant' in result.value.kwargs['msg']
+    assert result.value.kwargs['json'] == apiResult.body
+
+
+def test_remove_success_without_preget_reports_old_value_na():
+    apiResult = FakeResponse(200, {'data': {}})
+    with pytest.raises(ExitJson) as result:
+        oc_patch.apiResponse(makeModule('remove'), apiResult, None)
+    assert result.value.kwargs['old_value'] == 'N/A'
+    assert 'CHANGED' in result.value.kwargs['msg']
+
+
+def test_remove_failure_echoes_server_body():
+    # Error responses are falsy; their body must still reach the user.
+    apiResult = FakeResponse(401, {'message': 'Unauthorized'})
+    with pytest.raises(FailJson) as result:
+        oc_patch.apiResponse(makeModule('remove'), apiResult, None)
+    assert result.value.kwargs['json'] == apiResult.body